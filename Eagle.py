@@ -1,22 +1,40 @@
 import asyncio
 import os
+import sys
 from playwright.async_api import async_playwright
 from dotenv import load_dotenv
 from utils.dolphin_anty_utils import authorize_dolphin_anty, launch_profile, stop_profile
-from utils.page_processing import process_page
+from page_processing import process_page
 from utils.user_input_utils import start_input_listener
-from utils.screenshot_utils import take_screenshot
+from utils.screenshot_utils import ScreenshotService, normalize_screenshot_format, validate_screenshot_quality
+from utils.crawl_state import CrawlState
 import threading
 
 async def main():
-    """Main function to run the script."""
+    """Main function to run the script.
+
+    Returns 0 on success, or 1 if the crawl could not start or any URL failed.
+    """
     profile_id = "547791748"  # Replace with your Dolphin Anty profile ID
 
     load_dotenv()
     api_token = os.getenv("DOLPHIN_ANTY_TOKEN")
 
-    if not api_token or not await authorize_dolphin_anty(api_token):
-        return
+    # Validate the screenshot settings from .env before launching the profile
+    try:
+        screenshot_format = normalize_screenshot_format(os.getenv("SCREENSHOT_FORMAT", "png"))
+        screenshot_quality = validate_screenshot_quality(int(os.getenv("SCREENSHOT_QUALITY", "80")))
+        screenshot_interval = float(os.getenv("SCREENSHOT_INTERVAL", "0"))
+    except ValueError as e:
+        print(f"Error: invalid screenshot setting: {e}")
+        return 1
+    screenshot_full_page = os.getenv("SCREENSHOT_FULL_PAGE", "").lower() in ("1", "true", "yes")
+
+    if not api_token:
+        print("Error: DOLPHIN_ANTY_TOKEN is not set.")
+        return 1
+    if not await authorize_dolphin_anty(api_token):
+        return 1
 
     # First stop any existing profile
     await stop_profile(profile_id)
@@ -24,7 +42,7 @@ async def main():
 
     port, ws_endpoint = await launch_profile(profile_id)
     if not port or not ws_endpoint:
-        return
+        return 1
 
     async with async_playwright() as p:
         browser = await p.chromium.connect_over_cdp(f"ws://127.0.0.1:{port}{ws_endpoint}")
@@ -36,17 +54,28 @@ async def main():
                 urls = [line.strip() for line in f]
         except FileNotFoundError:
             print("Error: urls.txt not found.")
-            return
+            return 1
 
         # Create an event to signal moving to the next URL
         next_url_event = asyncio.Event()
 
+        # Screenshots are captured over CDP and written from a thread pool;
+        # format and auto-capture interval can be set in .env
+        screenshots = ScreenshotService(
+            image_format=screenshot_format,
+            quality=screenshot_quality,
+            full_page=screenshot_full_page,
+        )
+        if screenshot_interval > 0:
+            screenshots.start_auto_capture(page, screenshot_interval)
+
         # Create a queue to hold screenshot requests
         screenshot_queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
 
         def screenshot_callback():
-            """Callback to add screenshot request to the queue."""
-            screenshot_queue.put_nowait(page.url)
+            """Callback to add screenshot request to the queue from the listener thread."""
+            loop.call_soon_threadsafe(screenshot_queue.put_nowait, page.url)
 
         # Start the keyboard listener thread
         listener_thread = threading.Thread(
@@ -62,20 +91,44 @@ async def main():
                 url = await screenshot_queue.get()
                 if url == "quit":  # Signal to stop processing screenshots
                     break
-                await take_screenshot(page, url)
+                await screenshots.capture(page, url)
                 screenshot_queue.task_done()
 
         # Start the screenshot processing task
         screenshot_task = asyncio.create_task(process_screenshots())
 
+        # Record per-URL progress so an interrupted run resumes where it stopped
+        state = CrawlState()
+        failed_urls = []
+
         for url in urls:
+            if not url:
+                continue
+            if state.is_complete(url):
+                print(f"Skipping (already completed in this run): {url}")
+                continue
+
             # Reset the event for each URL
             next_url_event.clear()
-            await process_page(page, url, next_url_event)
+            state.mark_started(url)
+            try:
+                await process_page(browser, page, url, next_url_event, state=state)
+            except Exception as e:
+                print(f"  Error processing {url}: {e}")
+                state.mark_failed(url, e)
+                failed_urls.append(url)
+
+        # Leave the run open while any URL failed so a restart resumes and retries them
+        if failed_urls:
+            print(f"{len(failed_urls)} URL(s) failed; restart to resume this run and retry them.")
+        else:
+            state.finish_run()
+        state.close()
 
         # Stop the screenshot processing task
         await screenshot_queue.put("quit")
         await screenshot_task
+        await screenshots.close()
 
         try:
             await context.close()
@@ -91,10 +144,14 @@ async def main():
         # Make sure to stop the Dolphin profile at the end
         await stop_profile(profile_id)
 
+    return 1 if failed_urls else 0
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        sys.exit(asyncio.run(main()))
     except KeyboardInterrupt:
         print("Script interrupted by user.")
+        sys.exit(1)
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+        print(f"An unexpected error occurred: {e}")
+        sys.exit(1)
\ No newline at end of file
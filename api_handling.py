@@ -1,5 +1,6 @@
 import asyncio
 import json
+import os
 import re
 from urllib.parse import urlparse
 import json_repair
@@ -164,6 +165,7 @@ async def process_api_responses(browser, page, url, next_url_event):
                                                                         "json" if isinstance(response_body, (dict, list)) else "text")
                         if result:
                             result["url"] = request.url
+                            result["method"] = request.method
                             captured_responses.append(result)
 
                 except Exception as e:
@@ -190,6 +192,12 @@ async def process_api_responses(browser, page, url, next_url_event):
     # Remove the response handler from the page object
     page.remove_listener("response", handle_response)
 
+    return select_top_responses(captured_responses)
+
+def select_top_responses(captured_responses):
+    """
+    Returns the responses whose unique keyword counts are among the two highest.
+    """
     # Find the two highest unique keyword counts
     keyword_counts = set()
     for result in captured_responses:
@@ -204,4 +212,38 @@ async def process_api_responses(browser, page, url, next_url_event):
         result for result in captured_responses if result["keyword_count"] in top_two_counts
     ]
 
-    return top_responses
\ No newline at end of file
+    return top_responses
+
+def analyse_saved_responses(website_dir):
+    """
+    Re-scores the responses saved in a website directory's jsons/responses.json
+    and writes the top responses to jsons/responses_analysed.json.
+    """
+    json_dir = os.path.join(website_dir, "jsons")
+    responses_path = os.path.join(json_dir, "responses.json")
+    if not os.path.exists(responses_path):
+        return None
+
+    with open(responses_path, "r", encoding="utf-8") as f:
+        saved_responses = json.load(f)
+
+    analysed_responses = []
+    for saved in saved_responses:
+        content = saved.get("response_content")
+        if not content:
+            continue
+        try:
+            json.loads(content)
+            response_type = "json"
+        except (json.JSONDecodeError, TypeError):
+            response_type = "text"
+        result = find_keywords_and_objects_in_response(content, response_type)
+        if result:
+            result["url"] = saved.get("url")
+            analysed_responses.append(result)
+
+    output_path = os.path.join(json_dir, "responses_analysed.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(select_top_responses(analysed_responses), f, indent=4, ensure_ascii=False)
+    print(f"Analysed API responses to: {output_path}")
+    return output_path
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Command line entry point for the Eagle crawler and its offline tools.
+
+Usage:
+    python cli.py crawl
+    python cli.py extract-html [--base-dir websites] [--workers N] [url ...]
+    python cli.py analyse-responses [--base-dir websites] [--workers N] [url ...]
+    python cli.py minimise DIRECTORY [--workers N]
+    python cli.py bench [--repeat N]
+
+Heavy dependencies (Playwright, pynput, bs4, curl_cffi, json_repair, aiohttp,
+aiofiles) are imported inside the subcommand that needs them, so the offline
+subcommands never load the browser stack.
+"""
+import argparse
+import os
+import sys
+from urllib.parse import urlparse
+
+# Modules timed by `bench`, in roughly increasing import cost
+BENCH_MODULES = ["cli", "tessss", "api_handling", "html_processing", "page_processing", "Eagle"]
+
+def website_dirs(base_dir, urls):
+    """Returns the website directories for the given URLs, or all of them under base_dir."""
+    if urls:
+        return [os.path.join(base_dir, urlparse(url).netloc.replace(":", "_")) for url in urls]
+    if not os.path.isdir(base_dir):
+        return []
+    return sorted(
+        entry.path for entry in os.scandir(base_dir) if entry.is_dir()
+    )
+
+def run_in_workers(func, items, workers):
+    """
+    Runs func over items, in a process pool when workers > 1.
+    Returns the number of items that raised or returned nothing (missing input).
+    """
+    failures = 0
+
+    def check(item, result):
+        nonlocal failures
+        if not result:
+            print(f"Error: nothing to process for {item}")
+            failures += 1
+
+    if workers <= 1:
+        for item in items:
+            try:
+                check(item, func(item))
+            except Exception as e:
+                print(f"Error processing {item}: {e}")
+                failures += 1
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(func, item): item for item in items}
+            for future in as_completed(futures):
+                try:
+                    check(futures[future], future.result())
+                except Exception as e:
+                    print(f"Error processing {futures[future]}: {e}")
+                    failures += 1
+
+    if failures:
+        print(f"{failures} of {len(items)} item(s) failed.")
+    return failures
+
+def run_over_websites(func, args):
+    """Runs func over the selected website directories; returns the exit status."""
+    dirs = website_dirs(args.base_dir, args.urls)
+    if not dirs:
+        print(f"Error: no saved websites found in '{args.base_dir}'.")
+        return 1
+    return 1 if run_in_workers(func, dirs, args.workers) else 0
+
+def cmd_crawl(args):
+    """Runs the interactive browser crawl over urls.txt; returns 1 if it failed."""
+    import asyncio
+    import Eagle
+
+    try:
+        return asyncio.run(Eagle.main())
+    except KeyboardInterrupt:
+        print("Script interrupted by user.")
+        return 1
+
+def cmd_extract_html(args):
+    """Re-extracts script JSON from saved browser and curl_cffi HTML."""
+    from html_processing import process_website_dir
+
+    return run_over_websites(process_website_dir, args)
+
+def cmd_analyse_responses(args):
+    """Re-scores saved API responses."""
+    from api_handling import analyse_saved_responses
+
+    return run_over_websites(analyse_saved_responses, args)
+
+def cmd_minimise(args):
+    """Minimises the structure of every JSON file in a directory."""
+    from tessss import process_json_files
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: '{args.directory}' is not a valid directory.")
+        return 1
+    failures = process_json_files(args.directory, args.workers)
+    if failures:
+        print(f"{failures} file(s) could not be minimised.")
+        return 1
+
+def time_import(module, repeat):
+    """Returns the import times of a module in fresh interpreters, in seconds."""
+    import subprocess
+
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+            raise RuntimeError(error)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+def cmd_bench(args):
+    """Measures cold-start import time of the CLI and each module."""
+    import subprocess
+    import time
+
+    modules = args.modules or BENCH_MODULES
+    print(f"Import time over {args.repeat} fresh interpreter(s):")
+    for module in modules:
+        try:
+            timings = sorted(time_import(module, args.repeat))
+        except RuntimeError as e:
+            print(f"  {module:<16} error: {e}")
+            continue
+        median = timings[len(timings) // 2]
+        print(f"  {module:<16} min {timings[0] * 1000:8.1f} ms   median {median * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--help"], capture_output=True)
+    print(f"  {'cli --help':<16} wall {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+def build_parser():
+    """Builds the argument parser with one subparser per subcommand."""
+    parser = argparse.ArgumentParser(prog="eagle", description="Eagle crawler and offline tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl = subparsers.add_parser("crawl", help="Run the browser crawl over urls.txt.")
+    crawl.set_defaults(func=cmd_crawl)
+
+    for name, func, help_text in (
+        ("extract-html", cmd_extract_html, "Extract script JSON from saved HTML."),
+        ("analyse-responses", cmd_analyse_responses, "Re-score saved API responses."),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("urls", nargs="*", help="URLs to process (default: every saved website).")
+        sub.add_argument("--base-dir", default="websites", help="Directory holding saved websites.")
+        sub.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+        sub.set_defaults(func=func)
+
+    minimise = subparsers.add_parser("minimise", help="Minimise the structure of JSON files.")
+    minimise.add_argument("directory", help="The directory containing the JSON files.")
+    minimise.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+    minimise.set_defaults(func=cmd_minimise)
+
+    bench = subparsers.add_parser("bench", help="Measure import time of each module.")
+    bench.add_argument("modules", nargs="*", help=f"Modules to time (default: {', '.join(BENCH_MODULES)}).")
+    bench.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module.")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+def main(argv=None):
+    """Parses arguments and runs the selected subcommand."""
+    args = build_parser().parse_args(argv)
+    return args.func(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
+import asyncio
 import os
-import aiofiles
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import re
 import json_repair
 import json
 from collections import defaultdict
-from curl_cffi import requests
+
+# aiofiles and curl_cffi are imported inside the functions that use them so that
+# offline HTML processing does not pay for the network stack at import time.
 
 def ensure_directory(path):
     """Ensures the directory exists, creates it if it doesn't."""
@@ -15,6 +17,7 @@ def ensure_directory(path):
 
 async def save_html(page, url, base_dir="websites"):
     """Saves the browser-rendered HTML content of the current page."""
+    import aiofiles
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.replace(":", "_")
     html_dir = os.path.join(base_dir, domain, "htmls")
@@ -28,6 +31,7 @@ async def save_html(page, url, base_dir="websites"):
 
 async def save_html_cc(content, url, base_dir="websites"):
     """Saves the curl_cffi HTML content."""
+    import aiofiles
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.replace(":", "_")
     html_dir = os.path.join(base_dir, domain, "htmls")
@@ -38,26 +42,36 @@ async def save_html_cc(content, url, base_dir="websites"):
     print(f"  Curl_cffi HTML saved to: {filepath}")
     return filepath
 
-async def make_curl_cffi_request(url):
-    """Makes a request using curl_cffi with browser impersonation."""
-    print(f"Making curl_cffi request to: {url}")
+async def make_conditional_curl_cffi_request(url, etag=None, last_modified=None):
+    """
+    Makes a curl_cffi request with If-None-Match/If-Modified-Since validators.
+    Returns (status_code, text, etag, last_modified), or None if the request failed.
+    A 304 status means the page is unchanged and text is None.
+    The blocking request runs in a worker thread so the event loop keeps running.
+    """
+    from curl_cffi import requests
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        # Make request with just impersonation
-        response = requests.get(url, impersonate="chrome120")
-        
-        # Get text directly without awaiting
-        text = response.text
-        
-        if not text:
-            print("  Warning: Empty response text received")
-            return None
-            
-        return text
-        
+        response = await asyncio.to_thread(
+            requests.get, url, impersonate="chrome120", headers=headers or None
+        )
     except Exception as e:
-        print(f"  Error making curl_cffi request to {url}: {e}")
+        print(f"  Error making conditional curl_cffi request to {url}: {e}")
         return None
 
+    text = None if response.status_code == 304 else response.text
+    return (
+        response.status_code,
+        text,
+        response.headers.get("etag"),
+        response.headers.get("last-modified"),
+    )
+
 def find_keywords_and_objects_in_scripts(html_content, output_path, source_type="browser"):
     """
     Processes HTML content to find script elements, keywords, and JSON objects.
@@ -126,7 +140,14 @@ def process_html_files(url, base_dir="websites"):
     """
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.replace(":", "_")
-    website_dir = os.path.join(base_dir, domain)
+    process_website_dir(os.path.join(base_dir, domain))
+
+def process_website_dir(website_dir):
+    """
+    Process both HTML files (browser and cc) saved under a website directory.
+    Returns the paths of the JSON files written, empty if no HTML was found.
+    """
+    output_paths = []
     json_dir = os.path.join(website_dir, "jsons")
     html_dir = os.path.join(website_dir, "htmls")
 
@@ -138,6 +159,7 @@ def process_html_files(url, base_dir="websites"):
         os.makedirs(json_dir, exist_ok=True)
         find_keywords_and_objects_in_scripts(browser_html, browser_json_path, "browser")
         print(f"Processed browser HTML to: {browser_json_path}")
+        output_paths.append(browser_json_path)
 
     cc_html_path = os.path.join(html_dir, "cc.html")
     if os.path.exists(cc_html_path):
@@ -146,4 +168,7 @@ def process_html_files(url, base_dir="websites"):
         cc_json_path = os.path.join(json_dir, "cc.json")
         os.makedirs(json_dir, exist_ok=True)
         find_keywords_and_objects_in_scripts(cc_html, cc_json_path, "cc")
-        print(f"Processed curl_cffi HTML to: {cc_json_path}")
\ No newline at end of file
+        print(f"Processed curl_cffi HTML to: {cc_json_path}")
+        output_paths.append(cc_json_path)
+
+    return output_paths
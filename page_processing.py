@@ -3,14 +3,87 @@ import json
 import os
 from playwright.async_api import TimeoutError
 from api_handling import process_api_responses
-from html_processing import save_html, save_html_cc, make_curl_cffi_request, process_html_files
-from utils.screenshot_utils import take_screenshot
+from html_processing import save_html, save_html_cc, make_conditional_curl_cffi_request, process_html_files
+from utils.crawl_state import digest, api_fingerprint
 from urllib.parse import urlparse
 
-async def process_page(browser, page, url, next_url_event):
-    """Captures requests, filters, saves HTML, makes curl_cffi request, and handles user input."""
+def is_success(status):
+    """Returns True for a 2xx HTTP status."""
+    return 200 <= status < 300
+
+def get_api_fingerprints(top_responses):
+    """
+    Fingerprints the captured GET API responses by URL.
+    Returns (fingerprints, has_unreplayable_apis). POST/GraphQL responses can't
+    be replayed from the URL alone, and URLs seen with differing bodies can't be
+    compared reliably; if any such response was captured the page's API data
+    can't be checked, so has_unreplayable_apis is True.
+    """
+    fingerprints = {}
+    conflicting = set()
+    has_unreplayable_apis = False
+    for result in top_responses:
+        if result.get("method", "GET") != "GET":
+            has_unreplayable_apis = True
+            continue
+        api_url = result["url"]
+        fingerprint = api_fingerprint(result["response_content"])
+        if fingerprints.setdefault(api_url, fingerprint) != fingerprint:
+            conflicting.add(api_url)
+    for api_url in conflicting:
+        del fingerprints[api_url]
+        has_unreplayable_apis = True
+    return fingerprints, has_unreplayable_apis
+
+async def page_unchanged(url, record):
+    """
+    Checks a previously captured page for changes without the browser.
+    Sends a conditional curl_cffi request for the HTML and re-fetches each
+    recorded API URL concurrently, comparing against the stored digests and fingerprints.
+
+    Pages with API responses that could not be fingerprinted are always re-captured.
+    Pages where no API responses were captured are judged by their HTML alone,
+    since all of their saved outputs are derived from it.
+    """
+    if not record or not record.get("html_digest"):
+        return False
+    if record.get("has_unreplayable_apis"):
+        return False
+
+    result = await make_conditional_curl_cffi_request(
+        url, record.get("etag"), record.get("last_modified")
+    )
+    if result is None:
+        return False
+    status, text, _, _ = result
+    if status != 304 and not (is_success(status) and digest(text) == record["html_digest"]):
+        return False
+
+    fingerprints = record.get("api_fingerprints", {})
+    api_results = await asyncio.gather(
+        *(make_conditional_curl_cffi_request(api_url) for api_url in fingerprints)
+    )
+    for fingerprint, api_result in zip(fingerprints.values(), api_results):
+        if api_result is None or not is_success(api_result[0]):
+            return False
+        if api_fingerprint(api_result[1]) != fingerprint:
+            return False
+
+    return True
+
+async def process_page(browser, page, url, next_url_event, state=None):
+    """Captures requests, filters, saves HTML, makes curl_cffi request, and handles user input.
+
+    If a CrawlState is given, pages whose HTML and API fingerprints are unchanged
+    since the last capture are skipped, and the new capture's digests are recorded.
+    """
     print(f"Processing: {url}")
 
+    if state is not None and await page_unchanged(url, state.get(url)):
+        state.mark_unchanged(url)
+        print("  Page unchanged since last capture, skipping.")
+        return
+
     # Create directories
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.replace(":", "_")
@@ -25,8 +98,9 @@ async def process_page(browser, page, url, next_url_event):
 
     # Save the top responses to responses.json
     output_path = os.path.join(json_dir, "responses.json")
+    responses_json = json.dumps(top_responses, indent=4, ensure_ascii=False)
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(top_responses, f, indent=4, ensure_ascii=False)
+        f.write(responses_json)
 
     print(f"Processed API responses, saved top responses to: {output_path}")
 
@@ -35,12 +109,13 @@ async def process_page(browser, page, url, next_url_event):
     os.makedirs(htmls_dir, exist_ok=True)
 
     # Save the browser-rendered HTML
-    await save_html(page, url, base_dir="websites")
+    browser_html_path = await save_html(page, url, base_dir="websites")
 
     # Make a request using curl_cffi and save the response
     print("\nAttempting curl_cffi request...")
-    cc_response_content = await make_curl_cffi_request(url)
-    
+    cc_result = await make_conditional_curl_cffi_request(url)
+    cc_status, cc_response_content, etag, last_modified = cc_result or (None, None, None, None)
+
     if cc_response_content:
         try:
             await save_html_cc(cc_response_content, url, base_dir="websites")
@@ -53,5 +128,24 @@ async def process_page(browser, page, url, next_url_event):
     # Process both HTML files to extract JSON data
     process_html_files(url, base_dir="websites")
 
+    if state is not None:
+        with open(browser_html_path, "r", encoding="utf-8") as f:
+            browser_html_digest = digest(f.read())
+        # Only keep validators for a successful fetch; an error page must never
+        # let the next run decide the page is unchanged
+        if cc_status is None or not is_success(cc_status):
+            etag, last_modified, cc_response_content = None, None, None
+        api_fingerprints, has_unreplayable_apis = get_api_fingerprints(top_responses)
+        state.mark_done(
+            url,
+            etag=etag,
+            last_modified=last_modified,
+            html_digest=digest(cc_response_content),
+            browser_html_digest=browser_html_digest,
+            responses_digest=digest(responses_json),
+            api_fingerprints=api_fingerprints,
+            has_unreplayable_apis=has_unreplayable_apis,
+        )
+
     # Signal that processing for this URL is
     print("  URL processing complete.")
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
 import json
 import argparse
-from json_repair import repair_json
 
 def minimize_json_structure(json_data):
     """
@@ -18,53 +17,82 @@ def minimize_json_structure(json_data):
     else:
         return json_data  # Keep primitive values as they are
 
-def process_json_files(directory):
+def minimize_json_file(filepath, output_directory=None):
     """
-    Processes all JSON files in the given directory, minimizes their structures,
-    repairs the JSON if necessary, and saves the results to the current directory.
+    Minimizes the structure of a single JSON file, repairing the JSON if necessary,
+    and saves the result as minimized_<filename> in output_directory
+    (the current directory by default). Returns True if the file was saved.
     """
-    current_directory = os.getcwd()
+    output_directory = output_directory or os.getcwd()
+    filename = os.path.basename(filepath)
+    try:
+        with open(filepath, 'r') as f:
+            json_string = f.read()
+            try:
+                json_data = json.loads(json_string)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding JSON in {filename} before minimization: {e}")
+                return False  # Skip the file if initial load fails
 
-    for filename in os.listdir(directory):
-        if filename.endswith(".json"):
-            filepath = os.path.join(directory, filename)
+            minimized_structure = minimize_json_structure(json_data)
+
+            output_filename = f"minimized_{filename}"
+            output_filepath = os.path.join(output_directory, output_filename)
+
+            # Attempt to dump the minimized structure directly
             try:
-                with open(filepath, 'r') as f:
-                    json_string = f.read()
-                    try:
-                        json_data = json.loads(json_string)
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON in {filename} before minimization: {e}")
-                        continue  # Skip to the next file if initial load fails
+                with open(output_filepath, 'w') as outfile:
+                    json.dump(minimized_structure, outfile, indent=4)
+                print(f"Minimized structure for {filename} saved to {output_filename}")
+                return True
+            except json.JSONDecodeError:
+                # If dumping fails, attempt to repair the JSON string
+                from json_repair import repair_json
+                minimized_json_string = json.dumps(minimized_structure)
+                repaired_json_string = repair_json(minimized_json_string)
+                try:
+                    repaired_data = json.loads(repaired_json_string)
+                    with open(output_filepath, 'w') as outfile:
+                        json.dump(repaired_data, outfile, indent=4)
+                    print(f"Minimized and repaired structure for {filename} saved to {output_filename}")
+                    return True
+                except json.JSONDecodeError as e:
+                    print(f"Error repairing and saving JSON for {filename}: {e}")
 
-                    minimized_structure = minimize_json_structure(json_data)
+    except Exception as e:
+        print(f"Error processing {filename}: {e}")
+    return False
 
-                    output_filename = f"minimized_{filename}"
-                    output_filepath = os.path.join(current_directory, output_filename)
+def process_json_files(directory, workers=1):
+    """
+    Processes all JSON files in the given directory, minimizes their structures,
+    repairs the JSON if necessary, and saves the results to the current directory.
+    With workers > 1 the files are processed in a process pool.
+    Returns the number of files that could not be minimized.
+    """
+    current_directory = os.getcwd()
+    filepaths = [
+        os.path.join(directory, filename)
+        for filename in os.listdir(directory)
+        if filename.endswith(".json")
+    ]
+
+    if workers <= 1:
+        results = [minimize_json_file(filepath, current_directory) for filepath in filepaths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
 
-                    # Attempt to dump the minimized structure directly
-                    try:
-                        with open(output_filepath, 'w') as outfile:
-                            json.dump(minimized_structure, outfile, indent=4)
-                        print(f"Minimized structure for {filename} saved to {output_filename}")
-                    except json.JSONDecodeError:
-                        # If dumping fails, attempt to repair the JSON string
-                        minimized_json_string = json.dumps(minimized_structure)
-                        repaired_json_string = repair_json(minimized_json_string)
-                        try:
-                            repaired_data = json.loads(repaired_json_string)
-                            with open(output_filepath, 'w') as outfile:
-                                json.dump(repaired_data, outfile, indent=4)
-                            print(f"Minimized and repaired structure for {filename} saved to {output_filename}")
-                        except json.JSONDecodeError as e:
-                            print(f"Error repairing and saving JSON for {filename}: {e}")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                minimize_json_file, filepaths, [current_directory] * len(filepaths)
+            ))
 
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+    return results.count(False)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process JSON files in a directory, minimize their structures, and save the results to the current directory with JSON repair.")
     parser.add_argument("directory", help="The directory containing the JSON files.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
     args = parser.parse_args()
 
     directory_path = args.directory
@@ -72,4 +100,4 @@ if __name__ == "__main__":
     if not os.path.isdir(directory_path):
         print(f"Error: '{directory_path}' is not a valid directory.")
     else:
-        process_json_files(directory_path)
\ No newline at end of file
+        process_json_files(directory_path, args.workers)
\ No newline at end of file
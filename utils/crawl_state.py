@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+
+def utc_now():
+    """Returns the current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def digest(content):
+    """Returns the SHA-256 hex digest of a string or bytes."""
+    if content is None:
+        return None
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def api_fingerprint(body):
+    """
+    Returns a digest of an API response body that ignores JSON formatting
+    and key order, so browser-captured and curl_cffi-fetched bodies compare equal.
+    """
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except (json.JSONDecodeError, ValueError):
+            return digest(body)
+    return digest(json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False))
+
+
+class CrawlState:
+    """
+    Small SQLite store recording per-URL crawl status, HTTP validators and output digests.
+
+    A run that did not finish is resumed on the next start, skipping URLs already
+    completed in it. Once a run finishes, the next start begins a new run in which
+    previously captured pages can be checked for changes before re-capturing.
+    """
+
+    def __init__(self, path=os.path.join("websites", "crawl_state.db")):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                run_id INTEGER,
+                started_at TEXT,
+                completed_at TEXT,
+                checked_at TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                html_digest TEXT,
+                browser_html_digest TEXT,
+                responses_digest TEXT,
+                api_fingerprints TEXT,
+                has_unreplayable_apis INTEGER NOT NULL DEFAULT 0,
+                error TEXT
+            );
+        """)
+        # Databases created before has_unreplayable_apis existed need the column added;
+        # their pages were recorded without the check, so they are re-captured once
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(pages)")}
+        if "has_unreplayable_apis" not in columns:
+            self.conn.execute(
+                "ALTER TABLE pages ADD COLUMN has_unreplayable_apis INTEGER NOT NULL DEFAULT 0"
+            )
+            self.conn.execute("UPDATE pages SET has_unreplayable_apis = 1")
+        self.conn.commit()
+        self.run_id, self.resumed = self._begin_run()
+
+    def _begin_run(self):
+        """Resumes the latest unfinished run, or starts a new one."""
+        row = self.conn.execute(
+            "SELECT id, finished_at FROM runs ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row is not None and row["finished_at"] is None:
+            print(f"Resuming unfinished crawl run {row['id']} from {self.path}")
+            return row["id"], True
+        cursor = self.conn.execute("INSERT INTO runs (started_at) VALUES (?)", (utc_now(),))
+        self.conn.commit()
+        return cursor.lastrowid, False
+
+    def get(self, url):
+        """Returns the stored record for a URL as a dict, or None."""
+        row = self.conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["api_fingerprints"] = json.loads(record["api_fingerprints"] or "{}")
+        record["has_unreplayable_apis"] = bool(record["has_unreplayable_apis"])
+        return record
+
+    def is_complete(self, url):
+        """Returns True if the URL was already completed in the current run."""
+        row = self.conn.execute(
+            "SELECT 1 FROM pages WHERE url = ? AND status = 'done' AND run_id = ?",
+            (url, self.run_id),
+        ).fetchone()
+        return row is not None
+
+    def mark_started(self, url):
+        """Marks a URL as in progress, keeping any digests from earlier runs."""
+        self.conn.execute(
+            """
+            INSERT INTO pages (url, status, run_id, started_at) VALUES (?, 'in_progress', ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                status = 'in_progress', run_id = excluded.run_id,
+                started_at = excluded.started_at, error = NULL
+            """,
+            (url, self.run_id, utc_now()),
+        )
+        self.conn.commit()
+
+    def mark_unchanged(self, url):
+        """Marks a URL as done in the current run without a new capture."""
+        now = utc_now()
+        self.conn.execute(
+            "UPDATE pages SET status = 'done', run_id = ?, checked_at = ? WHERE url = ?",
+            (self.run_id, now, url),
+        )
+        self.conn.commit()
+
+    def mark_done(self, url, etag=None, last_modified=None, html_digest=None,
+                  browser_html_digest=None, responses_digest=None, api_fingerprints=None,
+                  has_unreplayable_apis=False):
+        """Marks a URL as captured in the current run and stores its validators and digests."""
+        now = utc_now()
+        self.conn.execute(
+            """
+            UPDATE pages SET
+                status = 'done', run_id = ?, completed_at = ?, checked_at = ?,
+                etag = ?, last_modified = ?, html_digest = ?, browser_html_digest = ?,
+                responses_digest = ?, api_fingerprints = ?, has_unreplayable_apis = ?,
+                error = NULL
+            WHERE url = ?
+            """,
+            (self.run_id, now, now, etag, last_modified, html_digest, browser_html_digest,
+             responses_digest, json.dumps(api_fingerprints or {}), int(has_unreplayable_apis), url),
+        )
+        self.conn.commit()
+
+    def mark_failed(self, url, error):
+        """
+        Marks a URL as failed so it is retried when the run is resumed.
+        Callers should leave the run open (skip finish_run) while any URL has failed.
+        """
+        self.conn.execute(
+            "UPDATE pages SET status = 'failed', run_id = ?, error = ? WHERE url = ?",
+            (self.run_id, str(error), url),
+        )
+        self.conn.commit()
+
+    def finish_run(self):
+        """Marks the current run as finished so the next start begins a new run."""
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?", (utc_now(), self.run_id)
+        )
+        self.conn.commit()
+
+    def close(self):
+        """Closes the underlying database connection."""
+        self.conn.close()
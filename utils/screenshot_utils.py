@@ -1,6 +1,196 @@
+import asyncio
+import base64
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-import asyncio
+
+SCREENSHOT_FORMATS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+SCREENSHOT_FORMAT_ALIASES = {"jpg": "jpeg"}
+SCREENSHOT_NAME_RE = re.compile(r"^(?P<base>.+)_(?P<index>\d+)\.(?:png|jpg|jpeg|webp)$")
+
+
+def normalize_screenshot_format(image_format):
+    """Returns the CDP format name for a case-insensitive format such as "PNG" or "jpg"."""
+    normalized = image_format.strip().lower()
+    normalized = SCREENSHOT_FORMAT_ALIASES.get(normalized, normalized)
+    if normalized not in SCREENSHOT_FORMATS:
+        raise ValueError(f"Unsupported screenshot format: {image_format}")
+    return normalized
+
+
+def validate_screenshot_quality(quality):
+    """Returns the quality if it is within the 0-100 range CDP accepts."""
+    if not 0 <= quality <= 100:
+        raise ValueError(f"Screenshot quality must be between 0 and 100, got {quality}")
+    return quality
+
+
+def screenshot_filename_base(url):
+    """Sanitizes the URL path into a screenshot filename base."""
+    parsed_url = urlparse(url)
+    filename_base = "".join(c if c.isalnum() or c in "._-" else "_" for c in parsed_url.path.strip("/"))
+    if not filename_base or filename_base == "/":
+        filename_base = "index"
+    return filename_base
+
+
+def write_screenshot(filepath, data):
+    """Decodes base64 screenshot data from CDP and writes it to disk."""
+    with open(filepath, "wb") as f:
+        f.write(base64.b64decode(data))
+    return filepath
+
+
+class ScreenshotService:
+    """
+    Captures screenshots through a CDP session so navigation on the shared page
+    is not interrupted, and offloads decoding and file writes to a thread pool.
+
+    Filenames are numbered from per-directory counters; each screenshots
+    directory is scanned once, after which picking a name is O(1).
+
+    Args:
+        base_dir: The base directory to save the screenshots to.
+        image_format: One of "png", "jpeg" (or "jpg") or "webp", case-insensitive.
+        quality: Compression quality (0-100) for jpeg and webp.
+        full_page: Capture the full scrollable page instead of the viewport.
+        clip: Optional {"x", "y", "width", "height"} region to capture.
+        max_workers: Number of threads used for decoding and writing files.
+    """
+
+    def __init__(self, base_dir="websites", image_format="png", quality=80,
+                 full_page=False, clip=None, max_workers=2):
+        self.base_dir = base_dir
+        self.image_format = normalize_screenshot_format(image_format)
+        self.quality = validate_screenshot_quality(quality)
+        self.full_page = full_page
+        self.clip = clip
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screenshot")
+        self._counters = {}
+        self._cdp_sessions = {}
+        self._pending = set()
+        self._auto_task = None
+
+    def _screenshot_counters(self, url):
+        """Returns the screenshots directory for the URL and its filename counters."""
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc.replace(":", "_")
+        screenshots_dir = os.path.join(self.base_dir, domain, "screenshots")
+
+        counters = self._counters.get(screenshots_dir)
+        if counters is None:
+            # Scan the directory once to continue numbering after earlier runs
+            os.makedirs(screenshots_dir, exist_ok=True)
+            counters = {}
+            with os.scandir(screenshots_dir) as entries:
+                for entry in entries:
+                    match = SCREENSHOT_NAME_RE.match(entry.name)
+                    if match:
+                        base, index = match.group("base"), int(match.group("index"))
+                        counters[base] = max(counters.get(base, 0), index)
+            self._counters[screenshots_dir] = counters
+        return screenshots_dir, counters
+
+    def _next_filepath(self, url):
+        """Claims the next unique screenshot path for the URL from the directory counters."""
+        screenshots_dir, counters = self._screenshot_counters(url)
+        filename_base = screenshot_filename_base(url)
+        index = counters.get(filename_base, 0) + 1
+        counters[filename_base] = index
+        extension = SCREENSHOT_FORMATS[self.image_format]
+        return os.path.join(screenshots_dir, f"{filename_base}_{index}.{extension}")
+
+    async def _cdp_session(self, page):
+        """Returns a cached CDP session for the page."""
+        session = self._cdp_sessions.get(page)
+        if session is None:
+            session = await page.context.new_cdp_session(page)
+            self._cdp_sessions[page] = session
+        return session
+
+    async def capture(self, page, url=None):
+        """Captures the page and schedules the file write; returns the target path.
+
+        Args:
+            page: The Playwright Page object.
+            url: The URL of the page being captured, defaults to page.url.
+        """
+        url = url or page.url
+
+        params = {"format": self.image_format}
+        if self.image_format != "png":
+            params["quality"] = self.quality
+
+        try:
+            session = await self._cdp_session(page)
+            if self.clip:
+                params["clip"] = {"scale": 1, **self.clip}
+            elif self.full_page:
+                metrics = await session.send("Page.getLayoutMetrics")
+                size = metrics.get("cssContentSize") or metrics["contentSize"]
+                params["clip"] = {"x": 0, "y": 0, "width": size["width"],
+                                  "height": size["height"], "scale": 1}
+                params["captureBeyondViewport"] = True
+            result = await session.send("Page.captureScreenshot", params)
+        except Exception as e:
+            print(f"  Error taking screenshot: {e}")
+            return None
+
+        # Claim the filename only once the capture succeeded, so failures leave no gaps
+        filepath = self._next_filepath(url)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, write_screenshot, filepath, result["data"])
+        self._pending.add(future)
+        future.add_done_callback(self._on_written)
+        return filepath
+
+    def _on_written(self, future):
+        """Reports the result of a background screenshot write."""
+        self._pending.discard(future)
+        try:
+            print(f"  Screenshot saved to: {future.result()}")
+        except Exception as e:
+            print(f"  Error saving screenshot: {e}")
+
+    def start_auto_capture(self, page, interval=30):
+        """Starts capturing the page every `interval` seconds for unattended runs."""
+        async def auto_capture():
+            while True:
+                await asyncio.sleep(interval)
+                if page.is_closed():
+                    break
+                if page.url.startswith(("http://", "https://")):
+                    await self.capture(page)
+
+        self._auto_task = asyncio.create_task(auto_capture())
+
+    async def stop_auto_capture(self):
+        """Stops the scheduled capture task, if running."""
+        if self._auto_task is not None:
+            self._auto_task.cancel()
+            try:
+                await self._auto_task
+            except asyncio.CancelledError:
+                pass
+            self._auto_task = None
+
+    async def close(self):
+        """Stops auto capture, waits for pending writes and shuts down the thread pool."""
+        await self.stop_auto_capture()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        for session in self._cdp_sessions.values():
+            try:
+                await session.detach()
+            except Exception:
+                pass
+        self._cdp_sessions.clear()
+        self.executor.shutdown(wait=True)
+
+
+_default_services = {}
+
 
 async def take_screenshot(page, url, base_dir="websites"):
     """Takes a screenshot of the current page and saves it with a unique name.
@@ -10,28 +200,7 @@ async def take_screenshot(page, url, base_dir="websites"):
         url: The URL of the page being captured.
         base_dir: The base directory to save the screenshots to.
     """
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc.replace(":", "_")
-    website_dir = os.path.join(base_dir, domain)
-    screenshots_dir = os.path.join(website_dir, "screenshots")
-    os.makedirs(screenshots_dir, exist_ok=True)
-
-    # Sanitize the URL path for the filename
-    filename_base = "".join(c if c.isalnum() or c in "._-" else "_" for c in parsed_url.path.strip("/"))
-    if not filename_base or filename_base == "/":
-        filename_base = "index"
-
-    # Find a unique filename
-    i = 1
-    while True:
-        filename = f"{filename_base}_{i}.png"
-        filepath = os.path.join(screenshots_dir, filename)
-        if not os.path.exists(filepath):
-            break
-        i += 1
-
-    try:
-        await page.screenshot(path=filepath)
-        print(f"  Screenshot saved to: {filepath}")
-    except Exception as e:
-        print(f"  Error taking screenshot: {e}")
\ No newline at end of file
+    service = _default_services.get(base_dir)
+    if service is None:
+        service = _default_services[base_dir] = ScreenshotService(base_dir=base_dir)
+    return await service.capture(page, url)